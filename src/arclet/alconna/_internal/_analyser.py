@@ -40,7 +40,7 @@ from ._handlers import (
     prompt,
 )
 from ._header import Header
-from ._util import levenshtein
+from ._util import levenshtein_ge
 
 if TYPE_CHECKING:
     from ..core import Alconna
@@ -202,7 +202,7 @@ class SubAnalyser(Generic[TDC]):
             if not argv.fuzzy_match:
                 raise InvalidParam(lang.require("subcommand", "name_error").format(source=sub.dest, target=name))
             for al in sub.aliases:
-                if levenshtein(name, al) >= argv.fuzzy_threshold:
+                if levenshtein_ge(name, al, argv.fuzzy_threshold):
                     raise FuzzyMatchSuccess(lang.require("fuzzy", "matched").format(source=al, target=name))
             raise InvalidParam(lang.require("subcommand", "name_error").format(source=sub.dest, target=name))
 
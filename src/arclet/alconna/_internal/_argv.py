@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field, fields, InitVar
+from itertools import islice
 from typing import Any, Callable, ClassVar, Generic, Iterable, Literal
 from typing_extensions import Self
 
@@ -30,7 +31,7 @@ class Argv(Generic[TDC]):
     """需要过滤掉的命令元素"""
     checker: Callable[[Any], bool] | None = field(default=None)
     """检查传入命令"""
-    param_ids: set[str] = field(default_factory=set)
+    param_ids: set[str] | frozenset[str] = field(default_factory=set)
     """节点名集合"""
 
     fuzzy_match: bool = field(init=False)
@@ -264,7 +265,7 @@ class Argv(Generic[TDC]):
             list[str | Any]: 剩余的数据.
         """
         _result = []
-        data = self.bak_data if recover else self.raw_data[self.current_index:]
+        data = self.bak_data if recover else islice(self.raw_data, self.current_index, None)
         for _data in data:
             if _data.__class__ is str and not _data:
                 continue
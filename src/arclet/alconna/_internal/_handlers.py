@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Iterable, Callable
 
 from nepattern import ANY, STRING, AnyString, BasePattern, TPattern
@@ -15,9 +16,9 @@ from ..config import config
 from ..exceptions import AlconnaException, ArgumentMissing, FuzzyMatchSuccess, InvalidParam, PauseTriggered, SpecialOptionTriggered
 from ..model import HeadResult, OptionResult, Sentence
 from ..output import output_manager
-from ..typing import KWBool, MultiKeyWordVar, MultiVar, _ShortcutRegWrapper, _StrMulti
+from ..typing import AllParam, KWBool, MultiKeyWordVar, MultiVar, _ShortcutRegWrapper, _StrMulti
 from ._header import Header
-from ._util import escape, levenshtein, unescape
+from ._util import escape, levenshtein_ge, unescape
 
 if TYPE_CHECKING:
     from ._analyser import Analyser, SubAnalyser
@@ -28,6 +29,13 @@ _bracket = re.compile(r"{(.+)}")
 _parentheses = re.compile(r"\$?\((.+)\)")
 
 
+@lru_cache(maxsize=None)
+def _kw_pattern(sep: str) -> TPattern:
+    """获取对应分隔符的具名参数匹配表达式"""
+    _sep = re.escape(sep)
+    return re.compile(rf"^(-*[^{_sep}]+){_sep}(.*?)$")
+
+
 def _context(argv: Argv, target: Arg[Any], _arg: str):
     _pat = _bracket if argv.context_style == "bracket" else _parentheses
     if not (mat := _pat.fullmatch(_arg)):
@@ -75,34 +83,38 @@ def step_varpos(argv: Argv, args: Args, slot: tuple[MultiVar, Arg], result: dict
     key = arg.name
     default_val = arg.field.default
     _result = []
-    kwonly_seps = tuple(arg.value.sep for arg in args.argument.keyword_only.values())  # type: ignore
+    seps = arg.separators
+    kwonly = args.argument.keyword_only
+    kwonly_seps = args.argument.keyword_seps
+    varkey_sep = args.argument.vars_keyword[0][0].base.sep if args.argument.vars_keyword else None
+    validate = value.base.validate
+    length = value.length
     count = 0
     while argv.current_index != argv.ndata:
-        may_arg, _str = argv.next(arg.separators)
-        if _str and may_arg in argv.special:
-            if argv.special[may_arg] not in argv.namespace.disable_builtin_options:
-                raise SpecialOptionTriggered(argv.special[may_arg])
+        may_arg, _str = argv.next(seps)
+        if _str and (special := argv.special.get(may_arg)) and special not in argv.namespace.disable_builtin_options:
+            raise SpecialOptionTriggered(special)
         if not may_arg or (_str and may_arg in argv.param_ids):
             argv.rollback(may_arg)
             break
         if _str and may_arg in config.remainders:
             break
-        if _str and kwonly_seps and split_once(pat.match(may_arg)["name"], kwonly_seps, argv.filter_crlf)[0] in args.argument.keyword_only:  # noqa: E501  # type: ignore
+        if _str and kwonly_seps and split_once(pat.match(may_arg)["name"], kwonly_seps, argv.filter_crlf)[0] in kwonly:  # noqa: E501  # type: ignore
             argv.rollback(may_arg)
             break
-        if _str and args.argument.vars_keyword and args.argument.vars_keyword[0][0].base.sep in may_arg:
+        if _str and varkey_sep is not None and varkey_sep in may_arg:
             argv.rollback(may_arg)
             break
-        if (res := value.base.validate(may_arg)).flag != "valid":
+        if (res := validate(may_arg)).flag != "valid":
             argv.rollback(may_arg)
             break
         _result.append(res._value)  # noqa
         count += 1
-        if 0 < value.length <= count:
+        if 0 < length <= count:
             break
     if not _result:
         if default_val is not Empty:
-            _result = default_val if isinstance(default_val, Iterable) else ()
+            _result = default_val if default_val.__class__ in (list, tuple) or isinstance(default_val, Iterable) else ()
         elif value.flag == "*":
             _result = ()
         elif arg.optional:
@@ -120,19 +132,19 @@ def step_varkey(argv: Argv, slot: tuple[MultiKeyWordVar, Arg], result: dict[str,
     argv.current_node = arg
     name = arg.name
     default_val = arg.field.default
+    kw_pattern = _kw_pattern(value.base.sep)
     _result = {}
     count = 0
     while argv.current_index != argv.ndata:
         may_arg, _str = argv.next(arg.separators)
-        if _str and may_arg in argv.special:
-            if argv.special[may_arg] not in argv.namespace.disable_builtin_options:
-                raise SpecialOptionTriggered(argv.special[may_arg])
+        if _str and (special := argv.special.get(may_arg)) and special not in argv.namespace.disable_builtin_options:
+            raise SpecialOptionTriggered(special)
         if not may_arg or (_str and may_arg in argv.param_ids) or not _str:
             argv.rollback(may_arg)
             break
         if _str and may_arg in config.remainders:
             break
-        if not (_kwarg := re.match(rf"^(-*[^{value.base.sep}]+){value.base.sep}(.*?)$", may_arg)):
+        if not (_kwarg := kw_pattern.match(may_arg)):
             argv.rollback(may_arg)
             break
         key = _kwarg[1]
@@ -161,14 +173,14 @@ def step_keyword(argv: Argv, args: Args, result: dict[str, Any]):
     kwonly_seps = set()
     for arg in args.argument.keyword_only.values():
         kwonly_seps.update(arg.separators)
-    kwonly_seps1 = tuple(arg.value.sep for arg in args.argument.keyword_only.values())  # type: ignore
+    seps = tuple(kwonly_seps)
+    kwonly_seps1 = args.argument.keyword_seps
     target = len(args.argument.keyword_only)
     count = 0
     while count < target:
-        may_arg, _str = argv.next(tuple(kwonly_seps))
-        if _str and may_arg in argv.special:
-            if argv.special[may_arg] not in argv.namespace.disable_builtin_options:
-                raise SpecialOptionTriggered(argv.special[may_arg])
+        may_arg, _str = argv.next(seps)
+        if _str and (special := argv.special.get(may_arg)) and special not in argv.namespace.disable_builtin_options:
+            raise SpecialOptionTriggered(special)
         if not may_arg or not _str:
             argv.rollback(may_arg)
             break
@@ -186,7 +198,7 @@ def step_keyword(argv: Argv, args: Args, result: dict[str, Any]):
                 if arg.value.base.validate(may_arg).flag == "valid":  # type: ignore
                     raise InvalidParam(lang.require("args", "key_missing").format(target=may_arg, key=arg.name))
             for name in args.argument.keyword_only:
-                if levenshtein(_key, name) >= argv.fuzzy_threshold:
+                if levenshtein_ge(_key, name, argv.fuzzy_threshold):
                     raise FuzzyMatchSuccess(lang.require("fuzzy", "matched").format(source=name, target=_key))
             raise InvalidParam(lang.require("args", "key_not_found").format(name=_key))
         arg = args.argument.keyword_only[_key]
@@ -221,12 +233,12 @@ def analyse_args(argv: Argv, args: Args) -> dict[str, Any]:
         dict[str, Any]: 解析结果
     """
     result = {}
-    for arg in args.argument.normal:
+    argument = args.argument
+    for arg in argument.normal:
         argv.current_node = arg
         may_arg, _str = argv.next(arg.separators)
-        if _str and may_arg in argv.special:
-            if argv.special[may_arg] not in argv.namespace.disable_builtin_options:
-                raise SpecialOptionTriggered(argv.special[may_arg])
+        if _str and (special := argv.special.get(may_arg)) and special not in argv.namespace.disable_builtin_options:
+            raise SpecialOptionTriggered(special)
         if _str and may_arg in argv.param_ids and arg.optional:
             if (de := arg.field.default) is not Empty:
                 result[arg.name] = de
@@ -240,14 +252,14 @@ def analyse_args(argv: Argv, args: Args) -> dict[str, Any]:
                 raise ArgumentMissing(arg.field.get_missing_tips(lang.require("args", "missing").format(key=arg.name)))
             continue
         value = arg.value
-        if value.alias == "*":
+        if value is AllParam:
             argv.rollback(may_arg)
             result[arg.name] = argv.converter(argv.release(no_split=True))
             argv.current_index = argv.ndata
             return result
         _validate(argv, arg, value, result, may_arg, _str)
-    if args.argument.unpack:
-        arg, unpack = args.argument.unpack
+    if argument.unpack:
+        arg, unpack = argument.unpack
         try:
             unpack.separate(*arg.separators)
             result[arg.name] = arg.value.origin(**analyse_args(argv, unpack))
@@ -256,11 +268,11 @@ def analyse_args(argv: Argv, args: Args) -> dict[str, Any]:
                 result[arg.name] = de
             elif not arg.optional:
                 raise e
-    for slot in args.argument.vars_positional:
+    for slot in argument.vars_positional:
         step_varpos(argv, args, slot, result)
-    if args.argument.keyword_only:
+    if argument.keyword_only:
         step_keyword(argv, args, result)
-    for slot in args.argument.vars_keyword:
+    for slot in argument.vars_keyword:
         step_varkey(argv, slot, result)
     argv.current_node = None
     return result
@@ -279,13 +291,14 @@ def handle_option(argv: Argv, opt: Option) -> tuple[str, OptionResult]:
     error = True
     name, _ = argv.next(opt.separators)
     if opt.compact:
-        for al in opt.aliases:
-            if mat := re.fullmatch(f"{al}(?P<rest>.*?)", name):
-                argv.rollback(mat["rest"], replace=True)
-                error = False
-                break
+        if name.startswith(opt._sorted_aliases):
+            for al in opt._sorted_aliases:
+                if name.startswith(al):
+                    argv.rollback(name[len(al):], replace=True)
+                    error = False
+                    break
     elif opt.action.type == 2:
-        for al in opt.aliases:
+        for al in opt._sorted_aliases:
             if name.startswith(al) and (cnt := (len(name.lstrip("-")) / len(al.lstrip("-")))).is_integer():
                 _cnt = int(cnt)
                 error = False
@@ -297,7 +310,7 @@ def handle_option(argv: Argv, opt: Option) -> tuple[str, OptionResult]:
         if not argv.fuzzy_match:
             raise InvalidParam(lang.require("option", "name_error").format(source=opt.dest, target=name))
         for al in opt.aliases:
-            if levenshtein(name, al) >= argv.fuzzy_threshold:
+            if levenshtein_ge(name, al, argv.fuzzy_threshold):
                 raise FuzzyMatchSuccess(lang.require("fuzzy", "matched").format(source=al, target=name))
         raise InvalidParam(lang.require("option", "name_error").format(source=opt.dest, target=name))
     name = opt.dest
@@ -339,13 +352,14 @@ def analyse_option(analyser: SubAnalyser, argv: Argv, opt: Option):
         opt (Option): 目标 `Option`
     """
     opt_n, opt_v = handle_option(argv, opt)
-    if opt_n not in analyser.options_result:
-        analyser.options_result[opt_n] = opt_v
+    results = analyser.options_result
+    if (prev := results.get(opt_n)) is None:
+        results[opt_n] = opt_v
         if opt.action.type == 1 and opt_v.args:
             for key in list(opt_v.args.keys()):
                 opt_v.args[key] = [opt_v.args[key]]
     else:
-        analyser.options_result[opt_n] = handle_action(opt, analyser.options_result[opt_n], opt_v)
+        results[opt_n] = handle_action(opt, prev, opt_v)
 
 
 def analyse_compact_params(analyser: SubAnalyser, argv: Argv):
@@ -407,6 +421,68 @@ def handle_opt_default(defaults: dict[str, tuple[OptionResult, Action]], data: d
             data[k].args.setdefault(key, [value] if v[1].value == 1 else value)
 
 
+def _param_option(analyser: SubAnalyser, argv: Argv, oparam: Option):
+    if oparam.requires and analyser.sentences != oparam.requires:
+        raise InvalidParam(
+            lang.require("option", "require_error").format(source=oparam.name, target=" ".join(analyser.sentences))
+        )
+    analyse_option(analyser, argv, oparam)
+
+
+def _param_options(analyser: SubAnalyser, argv: Argv, lparam: list[Option]):
+    exc: Exception | None = None
+    for opt in lparam:
+        _data, _index = argv.data_set()
+        try:
+            if opt.requires and analyser.sentences != opt.requires:
+                raise InvalidParam(
+                    lang.require("option", "require_error").format(
+                        source=opt.name, target=" ".join(analyser.sentences)
+                    )
+                )
+            analyser.sentences = []
+            analyse_option(analyser, argv, opt)
+            _data.clear()
+            exc = None
+            break
+        except Exception as e:
+            exc = e
+            argv.data_reset(_data, _index)
+    if exc:
+        raise exc  # type: ignore  # noqa
+
+
+def _param_subcommand(analyser: SubAnalyser, argv: Argv, sparam: SubAnalyser):
+    if sparam.command.requires and analyser.sentences != sparam.command.requires:
+        raise InvalidParam(
+            lang.require("subcommand", "require_error").format(
+                source=sparam.command.name, target=" ".join(analyser.sentences)
+            )
+        )
+    try:
+        sparam.process(argv)
+    except (FuzzyMatchSuccess, PauseTriggered, SpecialOptionTriggered):
+        sparam.result()
+        raise
+    except InvalidParam:
+        if argv.current_node is sparam.command:
+            sparam.result()
+        else:
+            analyser.subcommands_result[sparam.command.dest] = sparam.result()
+        raise
+    except AlconnaException:
+        analyser.subcommands_result[sparam.command.dest] = sparam.result()
+        raise
+    else:
+        analyser.subcommands_result[sparam.command.dest] = sparam.result()
+
+
+PARAM_HANDLES: dict[type, Callable[[SubAnalyser, Argv, Any], None]] = {
+    Option: _param_option,
+    list: _param_options,
+}
+
+
 def analyse_param(analyser: SubAnalyser, argv: Argv, seps: tuple[str, ...] | None = None):
     """处理参数
 
@@ -416,22 +492,18 @@ def analyse_param(analyser: SubAnalyser, argv: Argv, seps: tuple[str, ...] | Non
         seps (tuple[str, ...], optional): 指定的分隔符.
     """
     _text, _str = argv.next(seps, move=False)
-    if _str and _text in argv.special:
-        if argv.special[_text] not in argv.namespace.disable_builtin_options:
-            if _text in argv.completion_names:
-                argv.bak_data[argv.current_index] = argv.bak_data[argv.current_index].replace(_text, "")
-            raise SpecialOptionTriggered(argv.special[_text])
-    if not _str or not _text:
-        _param = None
-    elif _text in analyser.compile_params:
-        _param = analyser.compile_params[_text]
-    elif analyser.compact_params and (res := analyse_compact_params(analyser, argv)):
-        if res.__class__ is str:
-            raise InvalidParam(res)
-        argv.current_node = None
-        return True
-    else:
-        _param = None
+    if _str and (special := argv.special.get(_text)) and special not in argv.namespace.disable_builtin_options:
+        if _text in argv.completion_names:
+            argv.bak_data[argv.current_index] = argv.bak_data[argv.current_index].replace(_text, "")
+        raise SpecialOptionTriggered(special)
+    _param = None
+    if _str and _text:
+        _param = analyser.compile_params.get(_text)
+        if _param is None and analyser.compact_params and (res := analyse_compact_params(analyser, argv)):
+            if res.__class__ is str:
+                raise InvalidParam(res)
+            argv.current_node = None
+            return True
     if not _param and analyser.command.nargs and not analyser.args_result:
         analyser.args_result = analyse_args(argv, analyser.self_args)
         if analyser.args_result:
@@ -440,59 +512,8 @@ def analyse_param(analyser: SubAnalyser, argv: Argv, seps: tuple[str, ...] | Non
     if _param.__class__ is Sentence:
         analyser.sentences.append(argv.next()[0])
         return True
-    if _param.__class__ is Option:
-        oparam: Option = _param  # type: ignore
-        if oparam.requires and analyser.sentences != oparam.requires:
-            raise InvalidParam(
-                lang.require("option", "require_error").format(source=oparam.name, target=" ".join(analyser.sentences))
-            )
-        analyse_option(analyser, argv, oparam)
-    elif _param.__class__ is list:
-        exc: Exception | None = None
-        lparam: list[Option] = _param  # type: ignore
-        for opt in lparam:
-            _data, _index = argv.data_set()
-            try:
-                if opt.requires and analyser.sentences != opt.requires:
-                    raise InvalidParam(
-                        lang.require("option", "require_error").format(
-                            source=opt.name, target=" ".join(analyser.sentences)
-                        )
-                    )
-                analyser.sentences = []
-                analyse_option(analyser, argv, opt)
-                _data.clear()
-                exc = None
-                break
-            except Exception as e:
-                exc = e
-                argv.data_reset(_data, _index)
-        if exc:
-            raise exc  # type: ignore  # noqa
-    elif _param is not None:
-        sparam: SubAnalyser = _param  # type: ignore
-        if sparam.command.requires and analyser.sentences != sparam.command.requires:
-            raise InvalidParam(
-                lang.require("subcommand", "require_error").format(
-                    source=sparam.command.name, target=" ".join(analyser.sentences)
-                )
-            )
-        try:
-            sparam.process(argv)
-        except (FuzzyMatchSuccess, PauseTriggered, SpecialOptionTriggered):
-            sparam.result()
-            raise
-        except InvalidParam:
-            if argv.current_node is sparam.command:
-                sparam.result()
-            else:
-                analyser.subcommands_result[sparam.command.dest] = sparam.result()
-            raise
-        except AlconnaException:
-            analyser.subcommands_result[sparam.command.dest] = sparam.result()
-            raise
-        else:
-            analyser.subcommands_result[sparam.command.dest] = sparam.result()
+    if _param is not None:
+        PARAM_HANDLES.get(_param.__class__, _param_subcommand)(analyser, argv, _param)
     elif analyser.extra_allow:
         analyser.args_result.setdefault("$extra", []).append(_text)
         argv.next(seps, move=True)
@@ -573,20 +594,8 @@ def _after_analyse_header(header: Header, argv: Argv, head_text: Any, may_cmd: A
 
 
 def handle_head_fuzzy(header: Header, source: str, threshold: float):
-    command = header.origin[0]
-    if not header.origin[1]:
-        headers_text = [str(command)]
-    else:
-        headers_text = []
-        for prefix in header.origin[1]:
-            if isinstance(prefix, tuple):
-                headers_text.append(f"{prefix[0]} {prefix[1]}{command}")
-            elif isinstance(prefix, str):
-                headers_text.append(f"{prefix}{command}")
-            else:
-                headers_text.append(f"{prefix} {command}")
-    for ht in headers_text:
-        if levenshtein(source, ht) >= threshold:
+    for ht in header.fuzzy_texts:
+        if levenshtein_ge(source, ht, threshold):
             return lang.require("fuzzy", "matched").format(target=source, source=ht)
 
 
@@ -690,7 +699,7 @@ def _handle_shortcut_data(argv: Argv, data: list):
             break
 
     def recover_quote(_unit):
-        if isinstance(_unit, str) and any(_unit.count(sep) for sep in argv.separators) and not (_unit[0] in ('"', "'") and _unit[0] == _unit[-1]):
+        if isinstance(_unit, str) and any(sep in _unit for sep in argv.separators) and not (_unit[0] in ('"', "'") and _unit[0] == _unit[-1]):
             return f'"{_unit}"'
         return _unit
 
@@ -766,7 +775,7 @@ def _prompt_sentence(analyser: Analyser):
     return [Prompt(i) for i in res]
 
 
-def _prompt_none(analyser: Analyser, argv: Argv, got: list[str]):
+def _prompt_none(analyser: Analyser, argv: Argv, got: set[str]):
     res: list[Prompt] = []
     if not analyser.args_result and analyser.self_args.argument:
         unit = analyser.self_args.argument[0]
@@ -790,20 +799,21 @@ def _prompt_none(analyser: Analyser, argv: Argv, got: list[str]):
 def prompt(analyser: Analyser, argv: Argv, trigger: str | None = None):
     """获取补全列表"""
     _trigger = trigger or argv.current_node
-    got = [*analyser.options_result.keys(), *analyser.subcommands_result.keys(), *analyser.sentences]
     if isinstance(_trigger, Arg):
         return _prompt_unit(analyser, argv, _trigger)
     elif isinstance(_trigger, Subcommand):
         return [Prompt(i) for i in analyser.get_sub_analyser(_trigger).compile_params]  # type: ignore
     elif isinstance(_trigger, str):
-        res = list(filter(lambda x: _trigger in x, analyser.compile_params))
+        res = [x for x in analyser.compile_params if _trigger in x]
         if not res:
             return []
+        got = {*analyser.options_result, *analyser.subcommands_result, *analyser.sentences}
         out = [i for i in res if i not in got]
         return [Prompt(i, True, _trigger) for i in (out or res)]
+    got = {*analyser.options_result, *analyser.subcommands_result, *analyser.sentences}
     releases = argv.release(recover=True)
     target = str(releases[-1]) or str(releases[-2])
-    if _res := list(filter(lambda x: target in x and target != x, analyser.compile_params)):
+    if _res := [x for x in analyser.compile_params if target in x and target != x]:
         out = [i for i in _res if i not in got]
         return [Prompt(i, True, target) for i in (out or _res)]
     return _prompt_sentence(analyser) if analyser.sentences else _prompt_none(analyser, argv, got)
@@ -65,7 +65,7 @@ TCompact = TypeVar("TCompact", TPattern, BasePattern, None)
 class Header(Generic[TContent, TCompact]):
     """命令头部的匹配表达式"""
 
-    __slots__ = ("origin", "content", "mapping", "compact", "compact_pattern", "flag")
+    __slots__ = ("origin", "content", "mapping", "compact", "compact_pattern", "flag", "_fuzzy_texts")
 
     def __init__(
         self,
@@ -80,6 +80,7 @@ class Header(Generic[TContent, TCompact]):
         self.mapping = mapping or {}
         self.compact = compact
         self.compact_pattern: TCompact = compact_pattern  # type: ignore
+        self._fuzzy_texts: tuple[str, ...] | None = None
 
         if isinstance(self.content, set):
             self.flag = 0
@@ -106,6 +107,25 @@ class Header(Generic[TContent, TCompact]):
             return "│".join(map(str, self.content))
         return str(self.content)
 
+    @property
+    def fuzzy_texts(self) -> tuple[str, ...]:
+        """模糊匹配时用于比较的命令头文本"""
+        if self._fuzzy_texts is None:
+            command = self.origin[0]
+            if not self.origin[1]:
+                self._fuzzy_texts = (str(command),)
+            else:
+                texts = []
+                for prefix in self.origin[1]:
+                    if isinstance(prefix, tuple):
+                        texts.append(f"{prefix[0]} {prefix[1]}{command}")
+                    elif isinstance(prefix, str):
+                        texts.append(f"{prefix}{command}")
+                    else:
+                        texts.append(f"{prefix} {command}")
+                self._fuzzy_texts = tuple(texts)
+        return self._fuzzy_texts
+
     @classmethod
     def generate(
         cls,
@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+
 def levenshtein(source: str, target: str) -> float:
     """`编辑距离算法`_, 计算源字符串与目标字符串的相似度, 取值范围[0, 1], 值越大越相似
 
@@ -9,16 +12,106 @@ def levenshtein(source: str, target: str) -> float:
         https://en.wikipedia.org/wiki/Levenshtein_distance
 
     """
+    source, target = (source, target) if source <= target else (target, source)
+    _max = max(len(source), len(target))
+    return 1 - float(_distance(source, target, _max)) / _max
+
+
+def levenshtein_ge(source: str, target: str, threshold: float) -> bool:
+    """判断源字符串与目标字符串的相似度是否不低于阈值
+
+    由阈值换算出允许的最大编辑次数, 只在该宽度的对角带内计算编辑距离, 超出后提前结束
+
+    Args:
+        source (str): 源字符串
+        target (str): 目标字符串
+        threshold (float): 相似度阈值
+    """
+    l_s, l_t = len(source), len(target)
+    _max = max(l_s, l_t)
+    # 浮点舍入可能使估算偏差一位, 两个方向都按 `levenshtein` 的同一比较式校正
+    budget = int((1 - threshold) * _max)
+    while budget < _max and 1 - float(budget + 1) / _max >= threshold:
+        budget += 1
+    while budget >= 0 and 1 - float(budget) / _max < threshold:
+        budget -= 1
+    if abs(l_s - l_t) > budget:
+        return False
+    source, target = (source, target) if source <= target else (target, source)
+    return _distance(source, target, budget) <= budget
+
+
+@lru_cache(4096)
+def _distance(source: str, target: str, limit: int) -> int:
+    """计算不超过 limit 的编辑距离, 超过时返回 limit + 1"""
     l_s, l_t = len(source), len(target)
-    s_range, t_range = range(l_s + 1), range(l_t + 1)
-    matrix = [[(i if j == 0 else j) for j in t_range] for i in s_range]
+    if l_s < l_t:
+        source, target, l_s, l_t = target, source, l_t, l_s
+    over = limit + 1
+    if l_s - l_t > limit:
+        return over
+    # 公共前后缀不影响编辑距离, 去除后再进入 DP
+    start = 0
+    while start < l_t and source[start] == target[start]:
+        start += 1
+    while start < l_t and source[l_s - 1] == target[l_t - 1]:
+        l_s -= 1
+        l_t -= 1
+    if start or l_t != len(target):
+        source, target = source[start:l_s], target[start:l_t]
+        l_s -= start
+        l_t -= start
+    if not l_t:
+        return l_s if l_s <= limit else over
+    if l_t <= 64:
+        return min(_bit_distance(target, source), over)
+    prev = list(range(l_t + 1))
+    curr = [0] * (l_t + 1)
+    for i in range(1, l_s + 1):
+        char = source[i - 1]
+        lo, hi = max(1, i - limit), min(l_t, i + limit)
+        curr[lo - 1] = i if lo == 1 else over
+        row_min = curr[lo - 1]
+        for j in range(lo, hi + 1):
+            cost = prev[j - 1] + (char != target[j - 1])
+            if prev[j] + 1 < cost:
+                cost = prev[j] + 1
+            if curr[j - 1] + 1 < cost:
+                cost = curr[j - 1] + 1
+            curr[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if hi < l_t:
+            curr[hi + 1] = over
+        if row_min > limit:
+            return over
+        prev, curr = curr, prev
+    return min(prev[l_t], over)
 
-    for i in s_range[1:]:
-        for j in t_range[1:]:
-            sub_distance = matrix[i - 1][j - 1] + (0 if source[i - 1] == target[j - 1] else 1)
-            matrix[i][j] = min(matrix[i - 1][j] + 1, matrix[i][j - 1] + 1, sub_distance)
 
-    return 1 - float(matrix[l_s][l_t]) / max(l_s, l_t)
+def _bit_distance(pattern: str, text: str) -> int:
+    """Myers/Hyyrö 位并行编辑距离, 每个字符只需常数次位运算"""
+    peq = {}
+    for i, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    mask = (1 << len(pattern)) - 1
+    last = 1 << (len(pattern) - 1)
+    pv, mv, score = mask, 0, len(pattern)
+    for char in text:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & mask
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    return score
 
 
 ESCAPE = {"\\": "\x00", "[": "\x01", "]": "\x02", "{": "\x03", "}": "\x04", "|": "\x05"}
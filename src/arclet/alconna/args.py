@@ -174,12 +174,13 @@ NULL = {Empty: None, None: Empty}
 
 
 class _argument(List[Arg[Any]]):
-    __slots__ = ("unpack", "vars_positional", "vars_keyword", "keyword_only", "normal")
+    __slots__ = ("unpack", "vars_positional", "vars_keyword", "keyword_only", "keyword_seps", "normal")
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.normal: list[Arg[Any]] = []
         self.keyword_only: dict[str, Arg[Any]] = {}
+        self.keyword_seps: tuple[str, ...] = ()
         self.vars_positional: list[tuple[MultiVar, Arg[Any]]] = []
         self.vars_keyword: list[tuple[MultiKeyWordVar, Arg[Any]]] = []
         self.unpack: tuple[Arg, Args] | None = None
@@ -346,6 +347,7 @@ class Args(metaclass=ArgsMeta):
                 self.optional_count += 1
             elif arg.field.default is not Empty:
                 self.optional_count += 1
+        self.argument.keyword_seps = tuple(arg.value.sep for arg in self.argument.keyword_only.values())  # type: ignore
         self.argument.clear()
         self.argument.extend(_tmp)
         del _tmp
@@ -386,6 +388,7 @@ class Args(metaclass=ArgsMeta):
             self.argument.extend(other.argument)
             self.__check_vars__()
             self.argument.keyword_only.update(other.argument.keyword_only)
+            self.argument.keyword_seps = tuple(arg.value.sep for arg in self.argument.keyword_only.values())  # type: ignore
             del other
         elif isinstance(other, Arg):
             self.argument.append(other)
@@ -159,12 +159,16 @@ class Option(CommandNode):
     相比命令节点, 命令选项可以设置别名, 优先级, 允许名称与后随参数之间无分隔符
     """
 
+    __slots__ = ("_sorted_aliases",)
+
     default: OptionResult
     """命令选项默认值"""
     aliases: frozenset[str]
     """命令选项别名"""
     compact: bool
     "是否允许名称与后随参数之间无分隔符"
+    _sorted_aliases: tuple[str, ...]
+    "按长度降序排列的别名, 用于前缀匹配; 存于 slot 中, 不参与哈希计算"
 
     def __init__(
         self,
@@ -204,6 +208,7 @@ class Option(CommandNode):
         if self.separators == ("",):
             self.compact = True
             self.separators = (" ",)
+        self._sorted_aliases = tuple(sorted(self.aliases, key=lambda x: (-len(x), x)))
 
     @overload
     def __add__(self, other: Option) -> Subcommand:
@@ -2,8 +2,8 @@
 from __future__ import annotations
 
 import sys
-from dataclasses import dataclass, field, is_dataclass
-from functools import partial
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable, Generic, Literal, Sequence, TypeVar, cast, overload
 
@@ -26,6 +26,11 @@ from .typing import TDC, CommandMeta, DataCollection, InnerShortcutArgs, Shortcu
 T = TypeVar("T")
 TDC1 = TypeVar("TDC1", bound=DataCollection[Any])
 
+_HEAD_EXCLUDE = (list, Option, Subcommand, Args, Arg)
+_NODE_TYPES = (Option, Subcommand)
+_ARG_TYPES = (Args, Arg)
+_BUILTIN_OPTIONS = (Help, Shortcut, Completion)
+
 
 def handle_argv():
     path = Path(sys.argv[0])
@@ -114,6 +119,11 @@ class Alconna(Subcommand, Generic[TDC]):
     behaviors: list[ArparmaBehavior]
     """命令行为器"""
 
+    __slots__ = (
+        "prefixes", "command", "formatter", "namespace", "meta", "behaviors", "path",
+        "_executors", "union", "_batching", "_header_display", "_ns_name", "_shortcut_key",
+    )
+
     def compile(self, compiler: TCompile | None = None, param_ids: set[str] | None = None) -> Analyser[TDC]:
         """编译 `Alconna` 为对应的解析器"""
         return Analyser(self, compiler).compile(set() if param_ids is None else param_ids)
@@ -147,29 +157,30 @@ class Alconna(Subcommand, Generic[TDC]):
             ns_config = namespace
         self.prefixes = next((i for i in args if isinstance(i, list)), ns_config.prefixes.copy())  # type: ignore
         try:
-            self.command = next(i for i in args if not isinstance(i, (list, Option, Subcommand, Args, Arg)))
+            self.command = next(i for i in args if not isinstance(i, _HEAD_EXCLUDE))
         except StopIteration:
             self.command = "" if self.prefixes else handle_argv()
         self.namespace = ns_config.name
         self.formatter = (formatter_type or ns_config.formatter_type or TextFormatter)()
         self.meta = meta or CommandMeta()
-        if self.meta.example:
+        if self.meta.example and "$" in self.meta.example:
             self.meta.example = self.meta.example.replace("$", str(self.prefixes[0]) if self.prefixes else "")
         self.meta.fuzzy_match = self.meta.fuzzy_match or ns_config.fuzzy_match
         self.meta.raise_exception = self.meta.raise_exception or ns_config.raise_exception
         self.meta.compact = self.meta.compact or ns_config.compact
         self.meta.context_style = self.meta.context_style or ns_config.context_style
-        options = [i for i in args if isinstance(i, (Option, Subcommand))]
+        options = [i for i in args if isinstance(i, _NODE_TYPES)]
         add_builtin_options(options, ns_config)
         name = f"{self.command or self.prefixes[0]}"  # type: ignore
-        self.path = f"{self.namespace}::{name}"
-        _args = sum((i for i in args if isinstance(i, (Args, Arg))), Args())
+        self.path = sys.intern(f"{self.namespace}::{name}")
+        _args = sum((i for i in args if isinstance(i, _ARG_TYPES)), Args())
         super().__init__("ALCONNA::", _args, *options, dest=name, separators=separators or ns_config.separators, help_text=self.meta.description)  # noqa: E501
         self.name = name
         self.aliases = frozenset((name,))
         self.behaviors = []
         for behavior in behaviors or []:
             self.behaviors.extend(requirement_handler(behavior))
+        self._batching = False
         command_manager.register(self)
         self._executors: dict[ArparmaExecutor, Any] = {}
         self.union: "WeakSet[Alconna]" = WeakSet()
@@ -178,6 +189,29 @@ class Alconna(Subcommand, Generic[TDC]):
     def namespace_config(self) -> Namespace:
         return config.namespaces[self.namespace]
 
+    def _sync(self):
+        return nullcontext() if self._batching else command_manager.update(self)
+
+    @contextmanager
+    def batch(self):
+        """批量修改命令, 期间的更改仅在退出时同步一次
+
+        期间命令处于未注册状态, 此时调用 `parse` 或 `shortcut` 会抛出异常; 即便代码块内抛出异常, 退出时也会重新同步
+
+        Examples:
+            >>> with alc.batch():
+            ...     alc.option("foo").option("bar")
+        """
+        if self._batching:
+            yield self
+            return
+        with command_manager.update(self):
+            self._batching = True
+            try:
+                yield self
+            finally:
+                self._batching = False
+
     def reset_namespace(self, namespace: Namespace | str, header: bool = True) -> Self:
         """重新设置命名空间
 
@@ -185,18 +219,18 @@ class Alconna(Subcommand, Generic[TDC]):
             namespace (Namespace | str): 命名空间
             header (bool, optional): 是否保留命令头, 默认为 `True`
         """
-        with command_manager.update(self):
+        with self._sync():
             if isinstance(namespace, str):
                 namespace = config.namespaces.setdefault(namespace, Namespace(namespace))
             self.namespace = namespace.name
-            self.path = f"{self.namespace}::{self.name}"
+            self.path = sys.intern(f"{self.namespace}::{self.name}")
             if header:
                 self.prefixes = namespace.prefixes.copy()
                 name = f"{self.command or self.prefixes[0]}"  # type: ignore
                 self.dest = name
-                self.path = f"{self.namespace}::{name}"
+                self.path = sys.intern(f"{self.namespace}::{name}")
                 self.aliases = frozenset((name,))
-            self.options = [opt for opt in self.options if not isinstance(opt, (Help, Completion, Shortcut))]
+            self.options = [opt for opt in self.options if not isinstance(opt, _BUILTIN_OPTIONS)]
             add_builtin_options(self.options, namespace)
             self.meta.fuzzy_match = namespace.fuzzy_match or self.meta.fuzzy_match
             self.meta.raise_exception = namespace.raise_exception or self.meta.raise_exception
@@ -290,18 +324,19 @@ class Alconna(Subcommand, Generic[TDC]):
             if delete:
                 return command_manager.delete_shortcut(self, key)
             if kwargs and not args:
-                kwargs["args"] = kwargs.pop("arguments", None)
-                kwargs = {k: v for k, v in kwargs.items() if v is not None}
-                args = cast(ShortcutArgs, kwargs)
+                args = cast(
+                    ShortcutArgs,
+                    {("args" if k == "arguments" else k): v for k, v in kwargs.items() if v is not None},
+                )
             if args is not None:
                 return command_manager.add_shortcut(self, key, args)
             elif cmd := command_manager.recent_message:
                 alc = command_manager.last_using
-                if alc and alc == self:
+                if alc is not None and alc == self:
                     return command_manager.add_shortcut(self, key, {"command": cmd})  # type: ignore
                 raise ValueError(
                     lang.require("shortcut", "recent_command_error").format(
-                        target=self.path, source=getattr(alc, "path", "Unknown")
+                        target=self.path, source="Unknown" if alc is None else alc.path
                     )
                 )
             else:
@@ -323,7 +358,7 @@ class Alconna(Subcommand, Generic[TDC]):
         Returns:
             Self: 命令本身
         """
-        with command_manager.update(self):
+        with self._sync():
             self.options.append(opt)
         return self
 
@@ -392,9 +427,9 @@ class Alconna(Subcommand, Generic[TDC]):
     __rtruediv__ = __truediv__
 
     def __add__(self, other) -> Self:
-        with command_manager.update(self):
+        with self._sync():
             if isinstance(other, Alconna):
-                self.options.extend(other.options)
+                self.options.extend(opt for opt in other.options if not isinstance(opt, _BUILTIN_OPTIONS))
             elif isinstance(other, CommandMeta):
                 self.meta = other
             elif isinstance(other, Option):
@@ -406,34 +441,37 @@ class Alconna(Subcommand, Generic[TDC]):
                 self.options.append(Option(other))
         return self
 
-    def __or__(self, other: Alconna) -> Self:
-        self.union.add(other)
-
-        def _parse(message: TDC, ctx: dict[str, Any] | None = None) -> Arparma[TDC]:
+    def _union_parse(self, message: TDC, ctx: dict[str, Any] | None = None) -> Arparma[TDC]:
+        if self.union:
             for ana, argv in command_manager.unpack(self.union):
                 if (res := ana.process(argv.enter(ctx).build(message))).matched:
                     return res
-            return command_manager.require(self).process(command_manager.resolve(self).enter(ctx).build(message))
+        return Alconna._parse(self, message, ctx)
 
-        self._parse = _parse
+    def __or__(self, other: Alconna) -> Self:
+        if "_parse" not in self.__dict__:
+            self._parse = self._union_parse
+        self.union.add(other)
         return self
 
     def _calc_hash(self):
+        self._header_display = None
         return hash((self.path + str(self.prefixes), self.meta, *self.options, *self.args))
 
     def __call__(self, *args):
         if args:
             return self.parse(list(args))  # type: ignore
         head = handle_argv()
-        argv = [(f"\"{arg}\"" if any(arg.count(sep) for sep in self.separators) else arg) for arg in sys.argv[1:]]
+        argv = [(f"\"{arg}\"" if any(sep in arg for sep in self.separators) else arg) for arg in sys.argv[1:]]
         if head != self.command:
             return self.parse(argv)  # type: ignore
         return self.parse([head, *argv])  # type: ignore
 
     @property
     def header_display(self):
-        ana = command_manager.require(self)
-        return str(ana.command_header)
+        if self._header_display is None:
+            self._header_display = str(command_manager.require(self).command_header)
+        return self._header_display
 
 
 __all__ = ["Alconna", "ArparmaExecutor"]
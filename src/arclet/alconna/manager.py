@@ -5,10 +5,12 @@ from __future__ import annotations
 import contextlib
 import re
 import shelve
+import sys
 import weakref
 from copy import copy
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Match, MutableSet, Union
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Match, Union
 from weakref import WeakValueDictionary
 
 from nepattern import TPattern
@@ -25,6 +27,23 @@ if TYPE_CHECKING:
     from .core import Alconna
 
 
+@lru_cache(4096)
+def _shortcut_pattern(key: str, flags: int) -> TPattern:
+    """编译快捷命令的匹配表达式"""
+    return re.compile(key, flags)
+
+
+def _shortcut_needs_scan(key: str, args: Arparma | InnerShortcutArgs) -> bool:
+    """判断快捷命令是否需要正则匹配; 字面量的精确匹配已由字典查找覆盖, 无法编译的名称只作字面量处理"""
+    if not (isinstance(args, InnerShortcutArgs) and (args.fuzzy or args.flags)) and re.escape(key) == key:
+        return False
+    try:
+        _shortcut_pattern(key, getattr(args, "flags", 0))
+    except re.error:
+        return False
+    return True
+
+
 class CommandManager:
     """
     `Alconna` 命令管理器
@@ -39,35 +58,44 @@ class CommandManager:
     def max_count(self) -> int:
         return config.command_max_count
 
-    __commands: dict[str, WeakValueDictionary[str, Alconna]]
+    __commands: WeakValueDictionary[tuple[str, str], Alconna]
+    __namespaces: dict[str, dict[tuple[str, str], None]]
     __analysers: dict[int, Analyser]
+    __all_commands: list[Alconna] | None
     __argv: dict[int, Argv]
-    __abandons: list[Alconna]
+    __abandons: WeakValueDictionary[int, Alconna]
     __record: LRU[int, Arparma]
     __shortcuts: dict[str, tuple[dict[str, Union[Arparma, InnerShortcutArgs]], dict[str, Union[Arparma, InnerShortcutArgs]]]]
+    __shortcut_scans: dict[str, list[tuple[str, int, bool, bool, Union[Arparma, InnerShortcutArgs]]]]
 
     def __init__(self):
         self.cache_path = f"{__file__.replace('manager.py', '')}manager_cache.db"
         self.sign = "ALCONNA::"
         self.current_count = 0
 
-        self.__commands = {}
+        self.__commands = WeakValueDictionary()
+        self.__namespaces = {}
         self.__argv = {}
         self.__analysers = {}
-        self.__abandons = []
+        self.__all_commands = None
+        self.__abandons = WeakValueDictionary()
         self.__shortcuts = {}
+        self.__shortcut_scans = {}
         self.__record = LRU(128)
 
         def _del():
             self.__commands.clear()
+            self.__namespaces.clear()
             for ana in self.__analysers.values():
                 ana._clr()
             self.__analysers.clear()
+            self.__all_commands = None
             self.__abandons.clear()
             for arp in self.__record.values():
                 arp._clr()
             self.__record.clear()
             self.__shortcuts.clear()
+            self.__shortcut_scans.clear()
 
         weakref.finalize(self, _del)
 
@@ -76,6 +104,7 @@ class CommandManager:
         with contextlib.suppress(FileNotFoundError, KeyError):
             with shelve.open(self.cache_path) as db:
                 self.__shortcuts = dict(db["shortcuts"])  # type: ignore
+                self.__shortcut_scans.clear()
 
     def dump_cache(self) -> None:
         """保存缓存"""
@@ -96,7 +125,7 @@ class CommandManager:
         Returns:
             list[str]: 所有命名空间的名称
         """
-        return list(self.__commands.keys())
+        return list(self.__namespaces.keys())
 
     @staticmethod
     def _command_part(command: str) -> tuple[str, str]:
@@ -107,12 +136,14 @@ class CommandManager:
         return command_parts[0], command_parts[1]
 
     def get_namespace_config(self, name: str) -> Namespace | None:
-        if name not in self.__commands:
+        if name not in self.__namespaces:
             return
         return config.namespaces.get(name)
 
     def register(self, command: Alconna) -> None:
         """注册命令解析器, 会同时记录解析器对应的命令"""
+        namespace, name = command._ns_name = self._command_part(command.path)
+        command._shortcut_key = f"{namespace}.{name}"
         if self.current_count >= self.max_count:
             raise ExceedMaxCount
         cmd_hash = command._hash
@@ -120,15 +151,18 @@ class CommandManager:
         argv = self.__argv[cmd_hash] = __argv_type__.get()(command.meta, command.namespace_config, command.separators)  # type: ignore
         self.__analysers.pop(cmd_hash, None)
         self.__analysers[cmd_hash] = command.compile(param_ids=argv.param_ids)
-        namespace = self.__commands.setdefault(command.namespace, WeakValueDictionary())
-        if _cmd := namespace.get(command.name):
+        self.__all_commands = None
+        argv.param_ids = frozenset(argv.param_ids)
+        key = (command.namespace, command.name)
+        if _cmd := self.__commands.get(key):
             if _cmd == command:
                 return
             _cmd.formatter.add(command)
             command.formatter = _cmd.formatter
         else:
             command.formatter.add(command)
-            namespace[command.name] = command
+            self.__commands[key] = command
+            self.__namespaces.setdefault(command.namespace, {})[key] = None
             self.current_count += 1
 
     def _resolve(self, cmd_hash: int) -> Alconna:
@@ -140,8 +174,7 @@ class CommandManager:
         try:
             return self.__argv[cmd_hash]
         except KeyError as e:
-            namespace, name = self._command_part(command.path)
-            raise ValueError(lang.require("manager", "undefined_command").format(target=f"{namespace}.{name}")) from e
+            raise ValueError(lang.require("manager", "undefined_command").format(target=command._shortcut_key)) from e
 
     def require(self, command: Alconna[TDC]) -> Analyser[TDC]:
         """获取命令解析器"""
@@ -149,30 +182,29 @@ class CommandManager:
         try:
             return self.__analysers[cmd_hash]  # type: ignore
         except KeyError as e:
-            namespace, name = self._command_part(command.path)
-            raise ValueError(lang.require("manager", "undefined_command").format(target=f"{namespace}.{name}")) from e
+            raise ValueError(lang.require("manager", "undefined_command").format(target=command._shortcut_key)) from e
 
-    def unpack(self, commands: MutableSet[Alconna]) -> "zip[tuple[Analyser, Argv]]":
+    def unpack(self, commands: Iterable[Alconna]) -> Iterator[tuple[Analyser, Argv]]:
         """获取多个命令解析器"""
         hashs = {cmd._hash for cmd in commands}
-        return zip(
-            [v for k, v in self.__analysers.items() if k in hashs],
-            [v for k, v in self.__argv.items() if k in hashs],
-        )
+        return ((ana, self.__argv[h]) for h, ana in self.__analysers.items() if h in hashs)
 
     def delete(self, command: Alconna) -> None:
         """删除命令"""
-        namespace, name = self._command_part(command.path)
+        key = command._ns_name
         cmd_hash = command._hash
-        try:
-            command.formatter.remove(command)
-            del self.__argv[cmd_hash]
-            del self.__analysers[cmd_hash]
-            del self.__commands[namespace][name]
+        self.__argv.pop(cmd_hash, None)
+        if self.__analysers.pop(cmd_hash, None) is not None:
+            self.__all_commands = None
+        if self.__commands.get(key) is command:
+            del self.__commands[key]
             self.current_count -= 1
-        except KeyError:
-            if self.__commands.get(namespace) == {}:
-                del self.__commands[namespace]
+            keys = self.__namespaces[key[0]]
+            keys.pop(key, None)
+            if not keys:
+                del self.__namespaces[key[0]]
+        with contextlib.suppress(KeyError):
+            command.formatter.remove(command)
 
     @contextlib.contextmanager
     def update(self, command: Alconna):
@@ -180,38 +212,50 @@ class CommandManager:
         cmd_hash = command._hash
         if cmd_hash not in self.__argv:
             raise ValueError(lang.require("manager", "undefined_command").format(target=command.path))
-        namespace, name = self._command_part(command.path)
+        namespace, name = command._ns_name
         self.clear_result(command)
         command.formatter.remove(command)
         argv = self.__argv.pop(cmd_hash)
         analyser = self.__analysers.pop(cmd_hash)
-        del self.__commands[namespace][name]
-        yield
-        name = f"{command.command or command.prefixes[0]}"  # type: ignore
-        command.path = f"{command.namespace}::{name}"
-        cmd_hash = command._hash = command._calc_hash()
-        argv.namespace = command.namespace_config
-        argv.separators = command.separators
-        argv.__post_init__(command.meta)
-        argv.param_ids.clear()
-        analyser.compile(argv.param_ids)
-        self.__commands.setdefault(command.namespace, WeakValueDictionary())[name] = command
-        self.__argv[cmd_hash] = argv
-        self.__analysers[cmd_hash] = analyser
-        command.formatter.add(command)
+        self.__all_commands = None
+        del self.__commands[(namespace, name)]
+        keys = self.__namespaces[namespace]
+        keys.pop((namespace, name), None)
+        if not keys:
+            del self.__namespaces[namespace]
+        try:
+            yield
+        finally:
+            name = f"{command.command or command.prefixes[0]}"  # type: ignore
+            command.path = sys.intern(f"{command.namespace}::{name}")
+            command._ns_name = (command.namespace, name)
+            command._shortcut_key = f"{command.namespace}.{name}"
+            cmd_hash = command._hash = command._calc_hash()
+            argv.namespace = command.namespace_config
+            argv.separators = command.separators
+            argv.__post_init__(command.meta)
+            argv.param_ids = set()
+            analyser.compile(argv.param_ids)
+            argv.param_ids = frozenset(argv.param_ids)
+            self.__commands[command._ns_name] = command
+            self.__namespaces.setdefault(command.namespace, {})[command._ns_name] = None
+            self.__argv[cmd_hash] = argv
+            self.__analysers[cmd_hash] = analyser
+            self.__all_commands = None
+            command.formatter.add(command)
 
     def is_disable(self, command: Alconna) -> bool:
         """判断命令是否被禁用"""
-        return command in self.__abandons
+        return id(command) in self.__abandons
 
     def set_enabled(self, command: Alconna | str, enabled: bool):
         """设置命令是否被禁用"""
         if isinstance(command, str):
             command = self.get_command(command)
-        if enabled and command in self.__abandons:
-            self.__abandons.remove(command)
-        if not enabled and command not in self.__abandons:
-            self.__abandons.append(command)
+        if enabled:
+            self.__abandons.pop(id(command), None)
+        else:
+            self.__abandons[id(command)] = command
 
     def add_shortcut(self, target: Alconna, key: str | TPattern, source: Arparma | ShortcutArgs):
         """添加快捷命令
@@ -221,9 +265,10 @@ class CommandManager:
             key (str): 快捷命令的名称
             source (Arparma | ShortcutArgs): 快捷命令的参数
         """
-        namespace, name = self._command_part(target.path)
+        short_key = target._shortcut_key
         argv = self.resolve(target)
-        _shortcut = self.__shortcuts.setdefault(f"{namespace}.{name}", ({}, {}))
+        _shortcut = self.__shortcuts.setdefault(short_key, ({}, {}))
+        self.__shortcut_scans.pop(short_key, None)
         if isinstance(key, str):
             _key = key
             _flags = 0
@@ -235,20 +280,18 @@ class CommandManager:
             if source.get("prefix", False) and target.prefixes:
                 prefixes = []
                 out = []
+                command = source.get("command", str(target.command))
+                success = lang.require("shortcut", "add_success")
                 for prefix in target.prefixes:
                     if not isinstance(prefix, str):
                         continue
                     prefixes.append(prefix)
                     _shortcut[1][f"{re.escape(prefix)}{_key}"] = InnerShortcutArgs(
-                        **{**source, "command": argv.converter(prefix + source.get("command", str(target.command)))},
-                        flags=_flags,
-                    )
-                    out.append(
-                        lang.require("shortcut", "add_success").format(shortcut=f"{prefix}{_key}", target=target.path)
+                        **{**source, "command": argv.converter(prefix + command)}, flags=_flags
                     )
+                    out.append(success.format(shortcut=f"{prefix}{_key}", target=target.path))
                 _shortcut[0][humanize or _key] = InnerShortcutArgs(
-                    **{**source, "command": argv.converter(source.get("command", str(target.command))), "prefixes": prefixes},
-                    flags=_flags,
+                    **{**source, "command": argv.converter(command), "prefixes": prefixes}, flags=_flags
                 )
                 target.formatter.update_shortcut(target)
                 return "\n".join(out)
@@ -274,11 +317,11 @@ class CommandManager:
         Returns:
             dict[str, Arparma | InnerShortcutArgs]: 快捷命令的参数
         """
-        namespace, name = self._command_part(target.path)
+        short_key = target._shortcut_key
         cmd_hash = target._hash
         if cmd_hash not in self.__analysers:
-            raise ValueError(lang.require("manager", "undefined_command").format(target=f"{namespace}.{name}"))
-        shortcuts = self.__shortcuts.get(f"{namespace}.{name}", {})
+            raise ValueError(lang.require("manager", "undefined_command").format(target=short_key))
+        shortcuts = self.__shortcuts.get(short_key, {})
         if not shortcuts:
             return {}
         return shortcuts[0]
@@ -295,36 +338,55 @@ class CommandManager:
         Returns:
             tuple[list, Union[Arparma, InnerShortcutArgs], re.Match[str]]: 返回匹配的快捷命令
         """
-        namespace, name = self._command_part(target.path)
-        if not (_shortcut := self.__shortcuts.get(f"{namespace}.{name}")):
-            raise ValueError(lang.require("manager", "undefined_command").format(target=f"{namespace}.{name}"))
-        query: str = data.pop(0)
+        short_key = target._shortcut_key
+        if not (_shortcut := self.__shortcuts.get(short_key)):
+            raise ValueError(lang.require("manager", "undefined_command").format(target=short_key))
+        query: str = data[0]
+        if query in _shortcut[1]:
+            return data[1:], _shortcut[1][query], None
+        if (scans := self.__shortcut_scans.get(short_key)) is None:
+            scans = self.__shortcut_scans[short_key] = [
+                (
+                    key,
+                    getattr(args, "flags", 0),
+                    isinstance(args, InnerShortcutArgs) and args.fuzzy,
+                    isinstance(args, InnerShortcutArgs) and not args.fuzzy,
+                    args,
+                )
+                for key, args in _shortcut[1].items()
+                if _shortcut_needs_scan(key, args)
+            ]
+        index, total = 1, len(data)
+        sep = target.separators[0]
         while True:
             if query in _shortcut[1]:
-                return data, _shortcut[1][query], None
-            for key, args in _shortcut[1].items():
-                if isinstance(args, InnerShortcutArgs) and args.fuzzy and (mat := re.match(f"^{key}", query, args.flags)):
-                    if len(query) > mat.span()[1]:
-                        data.insert(0, query[mat.span()[1]:])
-                    return data, args, mat
-                elif mat := re.fullmatch(key, query, getattr(args, "flags", 0)):
-                    if not (isinstance(args, InnerShortcutArgs) and not args.fuzzy and data):
-                        return data, _shortcut[1][key], mat
-            if not data:
+                return data[index:], _shortcut[1][query], None
+            for key, flags, fuzzy, strict, args in scans:
+                pattern = _shortcut_pattern(key, flags)
+                if fuzzy and (mat := pattern.match(query)):
+                    if len(query) > (end := mat.end()):
+                        return [query[end:], *data[index:]], args, mat
+                    return data[index:], args, mat
+                elif mat := pattern.fullmatch(query):
+                    if not (strict and index < total):
+                        return data[index:], args, mat
+            if index == total:
                 break
-            next_data = data.pop(0)
+            next_data = data[index]
+            index += 1
             if not isinstance(next_data, str):
                 break
-            query += f"{target.separators[0]}{next_data}"
+            query += sep + next_data
         raise ValueError(
-            lang.require("manager", "shortcut_parse_error").format(target=f"{namespace}.{name}", query=query)
+            lang.require("manager", "shortcut_parse_error").format(target=short_key, query=query)
         )
 
     def delete_shortcut(self, target: Alconna, key: str | TPattern | None = None):
         """删除快捷命令"""
-        namespace, name = self._command_part(target.path)
-        if not (_shortcut := self.__shortcuts.get(f"{namespace}.{name}")):
-            raise ValueError(lang.require("manager", "undefined_command").format(target=f"{namespace}.{name}"))
+        short_key = target._shortcut_key
+        if not (_shortcut := self.__shortcuts.get(short_key)):
+            raise ValueError(lang.require("manager", "undefined_command").format(target=short_key))
+        self.__shortcut_scans.pop(short_key, None)
         if key:
             _key = key if isinstance(key, str) else key.pattern
             try:
@@ -333,28 +395,30 @@ class CommandManager:
                 return lang.require("shortcut", "delete_success").format(shortcut=_key, target=target.path)
             except KeyError as e:
                 raise ValueError(
-                    lang.require("manager", "shortcut_parse_error").format(target=f"{namespace}.{name}", query=_key)
+                    lang.require("manager", "shortcut_parse_error").format(target=short_key, query=_key)
                 ) from e
         else:
-            self.__shortcuts.pop(f"{namespace}.{name}")
+            self.__shortcuts.pop(short_key)
             return lang.require("shortcut", "delete_success").format(shortcut="all", target=target.path)
 
     def get_command(self, command: str) -> Alconna:
         """获取命令"""
         namespace, name = self._command_part(command)
-        if namespace not in self.__commands or name not in self.__commands[namespace]:
+        if (cmd := self.__commands.get((namespace, name))) is None:
             raise ValueError(command)
-        return self.__commands[namespace][name]
+        return cmd
 
     def get_commands(self, namespace: str | Namespace = "") -> list[Alconna]:
         """获取命令列表"""
         if not namespace:
-            return [ana.command for ana in self.__analysers.values()]
+            if self.__all_commands is None:
+                self.__all_commands = [ana.command for ana in self.__analysers.values()]
+            return self.__all_commands.copy()
         if isinstance(namespace, Namespace):
             namespace = Namespace.name
-        if namespace not in self.__commands:
+        if namespace not in self.__namespaces:
             return []
-        return list(self.__commands[namespace].values())
+        return [cmd for key in self.__namespaces[namespace] if (cmd := self.__commands.get(key)) is not None]
 
     def test(self, message: TDC, namespace: str | Namespace = "") -> Arparma[TDC] | None:
         """将一段命令给当前空间内的所有命令测试匹配"""
@@ -397,23 +461,23 @@ class CommandManager:
         slots = [(cmd.header_display, cmd.meta.description) for cmd in cmds]
         header = header or lang.require("manager", "help_header")
         if max_length < 1:
+            width = len(str(len(cmds)))
             command_string = (
-                "\n".join(f" {str(index).rjust(len(str(len(cmds))), '0')} {slot[0]} : {slot[1]}" for index, slot in enumerate(slots))  # noqa: E501
+                "\n".join([f" {index:0{width}d} {n} : {d}" for index, (n, d) in enumerate(slots)])
                 if show_index
-                else "\n".join(f" - {n} : {d}" for n, d in slots)
+                else "\n".join([f" - {n} : {d}" for n, d in slots])
             )
         else:
             max_page = len(cmds) // max_length + 1
             if page < 1 or page > max_page:
                 page = 1
             header += "\t" + pages.format(current=page, total=max_page)
+            width = len(str(page * max_length))
+            start = (page - 1) * max_length
             command_string = (
-                "\n".join(
-                    f" {str(index).rjust(len(str(page * max_length)), '0')} {slot[0]} : {slot[1]}"
-                    for index, slot in enumerate(slots[(page - 1) * max_length: page * max_length], start=(page - 1) * max_length)  # noqa: E501
-                )
+                "\n".join([f" {index:0{width}d} {n} : {d}" for index, (n, d) in enumerate(slots[start: start + max_length], start=start)])  # noqa: E501
                 if show_index
-                else "\n".join(f" - {n} : {d}" for n, d in slots[(page - 1) * max_length: page * max_length])
+                else "\n".join([f" - {n} : {d}" for n, d in slots[start: start + max_length]])
             )
         help_names = set()
         for i in cmds:
@@ -423,8 +487,7 @@ class CommandManager:
 
     def all_command_raw_help(self, namespace: str | Namespace | None = None) -> dict[str, CommandMeta]:
         """获取所有命令的原始帮助信息"""
-        cmds = list(filter(lambda x: not x.meta.hide, self.get_commands(namespace or "")))
-        return {cmd.path: copy(cmd.meta) for cmd in cmds}
+        return {cmd.path: copy(cmd.meta) for cmd in self.get_commands(namespace or "") if not cmd.meta.hide}
 
     def command_help(self, command: str) -> str | None:
         """获取单个命令的帮助"""
@@ -476,6 +539,10 @@ class CommandManager:
 
     def reuse(self, index: int = -1):
         """获取当前记录中的某个值"""
+        if index == 0 and (rct := self.__record.peek_first_item()):
+            return self.__record[rct[0]]
+        if index == -1 and (rct := self.__record.peek_last_item()):
+            return self.__record[rct[0]]
         key = self.__record.keys()[index]
         return self.__record[key]
 
@@ -493,7 +560,7 @@ class CommandManager:
             + "\nRecords:\n"
             + "\n".join([f" [{k}]: {v[1].origin}" for k, v in enumerate(self.__record.items()[:20])])
             + "\nDisabled Commands:\n"
-            + f"[{', '.join(map(lambda x: x.path, self.__abandons))}]"
+            + f"[{', '.join(map(lambda x: x.path, self.__abandons.values()))}]"
         )
 
 
@@ -2,7 +2,7 @@ from typing import Union
 
 from nepattern import BasePattern, MatchMode, INTEGER, combine
 
-from arclet.alconna import ArgFlag, Args, KeyWordVar, Kw, Nargs, StrMulti
+from arclet.alconna import Alconna, ArgFlag, Args, CommandMeta, KeyWordVar, Kw, Nargs, StrMulti
 from devtool import analyse_args
 
 
@@ -80,6 +80,9 @@ def test_multi():
     }
     assert analyse_args(arg8_4, ["1 2 3 4"]).get("multi") == ("1", "2", "3", "4")
     assert analyse_args(arg8_4, ["a=b c=d"]).get("kwargs") == {"a": "b", "c": "d"}
+    assert analyse_args(arg8_1, ["-=b --=d"]).get("kwargs") == {"-": "b", "--": "d"}
+    alc8_1 = Alconna("args8_1", arg8_1, meta=CommandMeta(keep_crlf=True))
+    assert not alc8_1.parse("args8_1 a=b\nc").matched
 
 
 def test_anti():
@@ -150,6 +153,9 @@ def test_kwonly():
         "baz": False,
         "foo": "abc",
     }
+    arg14_3 = Args["foo", int] + Args["bar", KeyWordVar(int, ":")]
+    assert arg14_3.argument.keyword_seps == (":",)
+    assert analyse_args(arg14_3, ["123 bar:456"]) == {"foo": 123, "bar": 456}
 
 
 def test_pattern():
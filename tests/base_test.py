@@ -57,6 +57,9 @@ def test_subcommand():
 def test_compact():
     opt3 = Option("-Foo", Args["bar", int], compact=True)
     assert analyse_option(opt3, "-Foo123") == OptionResult(None, {"bar": 123})
+    opt3_1 = Option("-Foo|-F", Args["bar", str], compact=True)
+    assert analyse_option(opt3_1, "-Foobar") == OptionResult(None, {"bar": "bar"})
+    assert analyse_option(opt3_1, "-Fbar") == OptionResult(None, {"bar": "bar"})
 
 
 def test_add():
@@ -242,6 +242,21 @@ def test_alconna_add_option():
     assert len(alc8_1.options) == 5
     alc8_2 = "core8_2" + Option("baz")
     assert len(alc8_2.options) == 4
+    alc8_3 = Alconna("core8_3") + Alconna("core8_3_1", Option("qux"))
+    assert len(alc8_3.options) == 4
+    alc8_4 = Alconna("core8_4")
+    with alc8_4.batch():
+        alc8_4.option("foo").option("bar")
+        alc8_4.add(Option("baz"))
+    assert len(alc8_4.options) == 6
+    assert alc8_4.parse("core8_4 foo bar baz").matched
+    alc8_5 = Alconna("core8_5", Args["foo", int])
+    with pytest.raises(RuntimeError):
+        with alc8_5.batch():
+            alc8_5.option("foo")
+            raise RuntimeError
+    assert alc8_5.parse("core8_5 1").matched
+    assert alc8_5.parse("core8_5 foo 1").matched
 
 
 def test_from_callable():
@@ -335,6 +350,10 @@ def test_alconna_group():
     )
     assert alc14.parse("core14 --foo --bar 123").matched is True
     assert alc14.parse("core14 --baz --qux 123").matched is True
+    alc14_1 = Alconna("core14_1")
+    for i in range(6):
+        alc14_1 |= Alconna("core14_1", Args[f"arg{i}", str])
+    assert "arg0" in alc14_1.parse("core14_1 foo").all_matched_args
     print("\n---------------------------")
     print(alc14.get_help())
 
@@ -375,6 +394,8 @@ def test_fuzzy():
 
 
 def test_shortcut():
+    from tarina import lang
+
     from arclet.alconna import output_manager
 
     # 原始命令
@@ -418,6 +439,13 @@ def test_shortcut():
 
     alc16.parse("core16 --shortcut list")
 
+    alc16_2 = Alconna("core16_2", Args["x", int])
+    alc16_2_1 = Alconna("core16_2", ["!"], Args["y", str])
+    assert alc16_2.parse("core16_2 1").matched
+    assert alc16_2_1.shortcut("foo") == lang.require("shortcut", "recent_command_error").format(
+        target=alc16_2_1.path, source=alc16_2.path
+    )
+
     alc16_3 = Alconna(["/", "!"], "core16_3", Args["foo", bool])
     print(alc16_3.shortcut("test", {"prefix": True, "args": ["False"]}))
     assert not alc16_3.parse("test").matched
@@ -431,6 +459,12 @@ def test_shortcut():
     assert not alc16_4.parse("test t").matched
     alc16_4.parse("core16_4 --shortcut test1")
     assert alc16_4.parse("test1").matched
+    alc16_4.shortcut("hi(", {})
+    alc16_4.shortcut("yo", {})
+    assert alc16_4.parse("hi(").matched
+    assert alc16_4.parse("yo").matched
+    assert alc16_4.parse("test").matched
+    assert not alc16_4.parse("tes").matched
 
     alc16_5 = Alconna(["*", "+"], "core16_5", Args["foo", bool])
     alc16_5.shortcut("test", {"prefix": True, "args": ["True"]})
@@ -0,0 +1,26 @@
+from arclet.alconna import Alconna, command_manager
+
+
+def test_update_namespace():
+    mgr = Alconna("mgr", namespace="TestMgr").reset_namespace("TestMgr1")
+    assert "TestMgr" not in command_manager.get_loaded_namespaces
+    assert "TestMgr1" in command_manager.get_loaded_namespaces
+    assert command_manager.get_commands("TestMgr") == []
+    assert command_manager.get_command("TestMgr1::mgr") is mgr
+
+
+def test_delete():
+    mgr1 = Alconna("mgr1", namespace="TestMgr2")
+    command_manager.delete(mgr1)
+    count = command_manager.current_count
+    command_manager.delete(mgr1)
+    assert command_manager.current_count == count
+    assert "TestMgr2" not in command_manager.get_loaded_namespaces
+    assert command_manager.get_commands("TestMgr2") == []
+    mgr2 = Alconna("mgr2", namespace="TestMgr3")
+    mgr2_1 = Alconna("mgr2", ["!"], namespace="TestMgr3")
+    assert mgr2_1._hash != mgr2._hash
+    command_manager.delete(mgr2_1)
+    assert command_manager.get_command("TestMgr3::mgr2") is mgr2
+    assert mgr2.parse("mgr2").matched
+    assert "TestMgr3" in command_manager.get_loaded_namespaces
@@ -1,3 +1,4 @@
+from arclet.alconna._internal._util import levenshtein, levenshtein_ge
 from arclet.alconna.typing import DataCollection
 
 
@@ -10,6 +11,37 @@ def test_collection():
     assert issubclass(list, DataCollection)
 
 
+def test_levenshtein():
+    """测试编辑距离相似度"""
+    assert levenshtein("kitten", "sitting") == 1 - 3 / 7
+    assert levenshtein("sitting", "kitten") == levenshtein("kitten", "sitting")
+    assert levenshtein("abc", "abc") == 1.0
+    assert levenshtein_ge("--help", "--hlep", 0.6)
+    assert not levenshtein_ge("--help", "--hlep", 0.8)
+    assert levenshtein_ge("test", "tset", 0.5)
+    assert not levenshtein_ge("a", "abcdefg", 0.6)
+    assert levenshtein("aaaaaaaaaa", "bbbbbbbbba") < 0.1
+    assert not levenshtein_ge("aaaaaaaaaa", "bbbbbbbbba", 0.1)
+
+
+def test_levenshtein_trim(monkeypatch):
+    """测试编辑距离去除公共前后缀后再计算"""
+    from arclet.alconna._internal import _util
+
+    lengths = []
+    bit_distance = _util._bit_distance
+
+    def _record(pattern: str, text: str) -> int:
+        lengths.append((len(pattern), len(text)))
+        return bit_distance(pattern, text)
+
+    monkeypatch.setattr(_util, "_bit_distance", _record)
+    _util._distance.cache_clear()
+    assert levenshtein_ge("xhelp-command", "yhelp-command", 0.6)
+    assert levenshtein_ge("help-commandx", "help-commandy", 0.6)
+    assert lengths == [(1, 1), (1, 1)]
+
+
 if __name__ == "__main__":
     import pytest
 